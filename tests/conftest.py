@@ -0,0 +1,6 @@
+import os
+import sys
+
+# backend/lambda isn't an importable package ('lambda' is a keyword), so load app.py from its directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend', 'lambda'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
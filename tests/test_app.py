@@ -0,0 +1,229 @@
+"""Tests for the dashboard Lambda handler."""
+import json
+import threading
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError, NoRegionError
+
+import app
+
+
+def _client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'Query')
+
+
+def _metric_items(name):
+    return {'Items': [{
+        'metric_name': {'S': name},
+        'display_name': {'S': name.title()},
+        'actual_value': {'N': '5'},
+        'annual_target': {'N': '10'},
+        'attainment_percent': {'N': '50'},
+        'metric_type': {'S': 'count'}
+    }]}
+
+
+def _post_dashboards(user_aliases=None, body=None):
+    if body is None:
+        body = json.dumps({'user_aliases': user_aliases})
+    response = app.lambda_handler({'httpMethod': 'POST', 'path': '/api/dashboards', 'body': body}, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+@pytest.fixture
+def dynamodb():
+    client = mock.Mock()
+    with mock.patch.object(app, 'get_dynamodb', return_value=client):
+        yield client
+
+
+@pytest.mark.parametrize('body', [
+    'not json',
+    json.dumps(['jsmith']),
+    json.dumps({'user_aliases': 'jsmith'}),
+    json.dumps({'user_aliases': ['jsmith', 3]}),
+    json.dumps({'user_aliases': ['a'] * (app.MAX_BATCH_ALIASES + 1)}),
+])
+def test_post_dashboards_rejects_invalid_body(dynamodb, body):
+    status, data = _post_dashboards(body=body)
+
+    assert status == 400
+    assert 'error' in data
+    dynamodb.query.assert_not_called()
+
+
+def test_post_dashboards_returns_dashboards_in_request_order(dynamodb):
+    dynamodb.query.side_effect = lambda **kwargs: _metric_items(kwargs['ExpressionAttributeValues'][':ua']['S'])
+
+    status, data = _post_dashboards(['rbrown', 'jsmith', 'mjohnson'])
+
+    assert status == 200
+    assert [d['user_alias'] for d in data['dashboards']] == ['rbrown', 'jsmith', 'mjohnson']
+    assert [d['metrics'][0]['metric_name'] for d in data['dashboards']] == ['rbrown', 'jsmith', 'mjohnson']
+    assert dynamodb.query.call_count == 3
+
+
+def test_post_dashboards_queries_aliases_concurrently(dynamodb):
+    # Serial queries would never get all three threads to the barrier and time out
+    barrier = threading.Barrier(3, timeout=5)
+
+    def query(**kwargs):
+        barrier.wait()
+        return _metric_items('stored')
+
+    dynamodb.query.side_effect = query
+
+    status, data = _post_dashboards(['jsmith', 'mjohnson', 'rbrown'])
+
+    assert status == 200
+    assert len(data['dashboards']) == 3
+
+
+def test_post_dashboards_falls_back_per_alias_when_table_is_missing(dynamodb):
+    def query(**kwargs):
+        alias = kwargs['ExpressionAttributeValues'][':ua']['S']
+        if alias == 'mjohnson':
+            raise _client_error('ResourceNotFoundException')
+        return _metric_items('stored')
+
+    dynamodb.query.side_effect = query
+
+    status, data = _post_dashboards(['jsmith', 'mjohnson', 'rbrown'])
+
+    assert status == 200
+    metric_names = [[m['metric_name'] for m in d['metrics']] for d in data['dashboards']]
+    assert metric_names[0] == ['stored']
+    assert metric_names[1] == ['revenue_target', 'customer_engagements', 'win_rate']
+    assert metric_names[2] == ['stored']
+    # Every alias is still queried; one failure doesn't switch the rest to sample data
+    assert dynamodb.query.call_count == 3
+
+
+def test_post_dashboards_builds_client_once_when_dynamodb_is_unavailable():
+    with mock.patch.object(app, 'get_dynamodb', side_effect=NoRegionError()) as get_dynamodb:
+        status, data = _post_dashboards(['jsmith', 'mjohnson', 'rbrown'])
+
+    assert status == 200
+    assert [d['user_alias'] for d in data['dashboards']] == ['jsmith', 'mjohnson', 'rbrown']
+    get_dynamodb.assert_called_once_with()
+
+
+def test_post_dashboards_fails_instead_of_serving_sample_data_on_throttling(dynamodb):
+    dynamodb.query.side_effect = _client_error('ProvisionedThroughputExceededException')
+
+    status, data = _post_dashboards(['jsmith', 'rbrown'])
+
+    assert status == 500
+    assert data == {'error': 'Failed to retrieve dashboard data'}
+
+
+def test_post_dashboards_with_no_aliases(dynamodb):
+    status, data = _post_dashboards([])
+
+    assert status == 200
+    assert data == {'dashboards': []}
+    dynamodb.query.assert_not_called()
+
+
+
+def test_team_dashboard_returns_numbers_for_dynamodb_attributes(dynamodb):
+    dynamodb.query.return_value = {'Items': [
+        {'alias': {'S': 'jsmith'}, 'overall_attainment': {'N': '90.5'}, 'metrics_count': {'N': '3'}},
+        {'alias': {'S': 'rbrown'}, 'overall_attainment': {'N': '70.5'}},
+    ]}
+
+    response = app.lambda_handler({'httpMethod': 'GET', 'path': '/api/team-dashboard/manager1'}, None)
+    data = json.loads(response['body'])
+
+    assert response['statusCode'] == 200
+    assert data['team_summary']['avg_attainment'] == 80.5
+    assert data['team_members'][0]['overall_attainment'] == 90.5
+    assert data['team_members'][0]['metrics_count'] == 3
+    # Counts missing from the item are not filled in
+    assert 'on_track_metrics' not in data['team_members'][0]
+    assert 'metrics_count' not in data['team_members'][1]
+
+@pytest.fixture
+def users_cache():
+    with mock.patch.dict(app.USERS_CACHE, {'data': None, 'expires_at': 0.0}):
+        yield app.USERS_CACHE
+
+
+def _get_users(now):
+    with mock.patch.object(app.time, 'monotonic', return_value=now):
+        response = app.lambda_handler({'httpMethod': 'GET', 'path': '/api/users'}, None)
+    return json.loads(response['body'])['users']
+
+
+def test_get_users_serves_cached_scan_until_ttl_expires(dynamodb, users_cache):
+    dynamodb.scan.return_value = {'Items': [{'alias': {'S': 'dbuser'}, 'name': {'S': 'DB User'}}]}
+
+    assert _get_users(now=100.0) == [{'alias': 'dbuser', 'name': 'DB User'}]
+    assert _get_users(now=100.0 + app.USERS_CACHE_TTL_SECONDS - 1) == [{'alias': 'dbuser', 'name': 'DB User'}]
+    assert dynamodb.scan.call_count == 1
+
+    dynamodb.scan.return_value = {'Items': [{'alias': {'S': 'newuser'}}]}
+    assert _get_users(now=100.0 + app.USERS_CACHE_TTL_SECONDS) == [{'alias': 'newuser'}]
+    assert dynamodb.scan.call_count == 2
+
+
+@pytest.mark.parametrize('scan', [
+    {'side_effect': _client_error('ResourceNotFoundException')},
+    {'return_value': {'Items': []}},
+])
+def test_get_users_does_not_cache_sample_fallback(dynamodb, users_cache, scan):
+    dynamodb.scan.configure_mock(**scan)
+
+    assert [u['alias'] for u in _get_users(now=100.0)] == [u['alias'] for u in app.SAMPLE_USERS]
+    assert _get_users(now=101.0)
+    assert users_cache['data'] is None
+    assert dynamodb.scan.call_count == 2
+
+
+@pytest.mark.parametrize('method, path, expected', [
+    ('GET', '/api/users', {}),
+    ('GET', '/api/dashboard/jsmith', {'user_alias': 'jsmith'}),
+    ('GET', '/api/dashboard/j.smith-2', {'user_alias': 'jsmith'}),  # unknown aliases get the default sample user
+    ('GET', '/api/team-dashboard/manager1', {'manager_alias': 'manager1'}),
+])
+def test_routes_dispatch_matching_requests(dynamodb, users_cache, method, path, expected):
+    dynamodb.scan.side_effect = _client_error('ResourceNotFoundException')
+    dynamodb.query.side_effect = _client_error('ResourceNotFoundException')
+
+    response = app.lambda_handler({'httpMethod': method, 'path': path}, None)
+    data = json.loads(response['body'])
+
+    assert response['statusCode'] == 200
+    assert expected.items() <= data.items()
+
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/api/dashboard/'),
+    ('GET', '/api/dashboard/a/b'),
+    ('GET', '/api/dashboard/js mith'),
+    ('GET', '/api/users\n'),
+    ('GET', '/api/users/'),
+    ('GET', '/api/unknown'),
+    ('GET', '/api/dashboards'),
+    ('POST', '/api/users'),
+    ('DELETE', '/api/dashboard/jsmith'),
+])
+def test_routes_return_404_for_unmatched_requests(dynamodb, method, path):
+    response = app.lambda_handler({'httpMethod': method, 'path': path}, None)
+
+    assert response is app.NOT_FOUND_RESPONSE
+    assert response['statusCode'] == 404
+    assert json.loads(response['body']) == {'error': 'Endpoint not found'}
+    dynamodb.scan.assert_not_called()
+    dynamodb.query.assert_not_called()
+
+
+@pytest.mark.parametrize('path', ['/api/users', '/api/dashboards', '/anything'])
+def test_options_returns_cors_preflight_response(path):
+    response = app.lambda_handler({'httpMethod': 'OPTIONS', 'path': path}, None)
+
+    assert response is app.OPTIONS_RESPONSE
+    assert response['statusCode'] == 200
+    assert response['body'] == ''
+    assert response['headers']['Access-Control-Allow-Methods'] == 'GET, POST, OPTIONS'